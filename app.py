@@ -2,9 +2,15 @@ import streamlit as st
 import pandas as pd
 from sqlalchemy import create_engine, text
 import os
+import re
 import numpy as np
 import pydeck as pdk
-import json
+import shapely
+import orjson
+import psycopg2.extras
+
+# Decode json columns (the GeoJSON geometry) with orjson instead of stdlib json
+psycopg2.extras.register_default_json(globally=True, loads=orjson.loads)
 
 # -----------------------------
 # Page config
@@ -35,6 +41,24 @@ st.markdown(
         color: #111827;
         margin: 0 0 4px 0;
       }
+      /* Detail panel: two-column label/value grid */
+      .info-grid{
+        display: grid;
+        grid-template-columns: 1fr 1fr;
+        column-gap: 16px;
+      }
+      .info-cell{
+        margin: 6px 0 14px 0;
+      }
+      .info-label{
+        font-size: 13px;
+        color: #6b7280;
+      }
+      .info-value{
+        font-size: 16px;
+        font-weight: 600;
+        color: #111827;
+      }
       /* Make expander header look cleaner */
       div[data-testid="stExpander"] > details{
         border-radius: 12px;
@@ -74,85 +98,97 @@ search_query = st.text_input("Search", placeholder="Type to search…")
 # Helper functions
 # -----------------------------
 def safe_get(row, key, default="N/A"):
+    # row.get(key), with None / NA / NaN (or a failed lookup) -> default
     try:
         value = row.get(key)
-        if pd.isna(value) or value is None:
+        if value is None or value is pd.NA or (isinstance(value, float) and value != value):
             return default
         return value
     except Exception:
         return default
 
-def fmt_int(x):
-    if x is None or (isinstance(x, float) and pd.isna(x)):
-        return "N/A"
-    try:
-        return f"{int(round(float(x))):,}"
-    except Exception:
-        return "N/A"
-
-def fmt_float(x, nd=2):
-    if x is None or (isinstance(x, float) and pd.isna(x)):
-        return "N/A"
-    try:
-        return f"{float(x):.{nd}f}"
-    except Exception:
-        return "N/A"
-
-def fmt_height(x):
-    if x is None or (isinstance(x, float) and pd.isna(x)):
-        return "N/A"
-    try:
-        return f"{int(round(float(x)))} ft"
-    except Exception:
-        return "N/A"
-
-def fmt_area_sqft(x):
-    if x is None or (isinstance(x, float) and pd.isna(x)):
-        return "N/A"
-    if isinstance(x, str):
-        s = x.strip()
-        return s if s else "N/A"
-    try:
-        return f"{int(round(float(x))):,} sq ft"
-    except Exception:
-        return "N/A"
+_ZIP_TOKEN_RE = re.compile(r"[^\s,]+")
 
-def fmt_percent_from_ratio(ratio):
-    # ratio: 0.92 means 92%
-    if ratio is None or (isinstance(ratio, float) and pd.isna(ratio)):
-        return "N/A"
-    try:
-        return f"{int(round(float(ratio) * 100))}%"
-    except Exception:
-        return "N/A"
+def parse_zip_tokens(q):
+    """
+    Split a ZIP search string on whitespace/commas into unique,
+    zero-padded 5-character tokens (order preserved).
+    """
+    return list(dict.fromkeys(t.zfill(5) for t in _ZIP_TOKEN_RE.findall(q)))
 
-def fmt_percent_from_value(value):
-    # value: 92 means 92%
-    if value is None or (isinstance(value, float) and pd.isna(value)):
-        return "N/A"
-    try:
-        return f"{int(round(float(value)))}%"
-    except Exception:
-        return "N/A"
+# Column formatters: build display strings for a whole column at once
+# (run once per cache fill in load_data, never per row at render time).
+def _fmt_finite(values, fmt_array, scale=1.0):
+    """
+    Format the finite numeric values of a column with fmt_array
+    (ndarray -> sequence of str). Everything else becomes "N/A".
+    """
+    v = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float, na_value=np.nan) * scale
+    ok = np.isfinite(v)
+    out = np.full(len(v), "N/A", dtype=object)
+    out[ok] = fmt_array(v[ok])
+    return out
+
+def _round_int(v):
+    r = np.round(v)
+    if np.all(np.abs(r) < 2**63):
+        return r.astype(np.int64)
+    # Beyond int64 the cast would wrap; Python ints stay exact (as the
+    # old per-value int(round(x)) did)
+    return np.array([int(x) for x in r], dtype=object)
+
+def fmt_int_column(values):
+    # 1234.6 -> "1,235"; numpy has no digit-grouping kernel, so group
+    # over plain Python ints after the vectorized round
+    return _fmt_finite(values, lambda v: [f"{i:,}" for i in _round_int(v).tolist()])
+
+def fmt_float_column(values, nd=2):
+    return _fmt_finite(values, lambda v: np.char.mod(f"%.{nd}f", v))
+
+def fmt_height_column(values):
+    return _fmt_finite(values, lambda v: np.char.add(_round_int(v).astype(str), " ft"))
+
+def fmt_area_column(values):
+    # Numbers -> "1,234 sq ft"; text values pass through stripped, as stored
+    out = _fmt_finite(values, lambda v: [f"{i:,} sq ft" for i in _round_int(v).tolist()])
+    # object (pandas 2) or str (pandas 3 infers it for all-text columns)
+    if pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values):
+        is_text = values.map(lambda x: isinstance(x, str)).to_numpy(dtype=bool)
+        out[is_text] = [t.strip() or "N/A" for t in values[is_text]]
+    return out
+
+def fmt_percent_column(values, scale=1.0):
+    """
+    Percent strings for a whole column: scale=100 for ratios (0.92 -> 92%),
+    scale=1 for values already in percent.
+    """
+    return _fmt_finite(values, lambda v: np.char.add(_round_int(v).astype(str), "%"), scale)
 
-def get_geojson_center(geom_geojson):
+def get_row_center(row):
     """
-    Return (lat, lon) focus point from GeoJSON string.
-    Supports Polygon and MultiPolygon.
-    Uses first coordinate as a stable proxy for focus.
+    Return the (lat, lon) focus point precomputed in load_data, or None.
     """
-    try:
-        geom = json.loads(geom_geojson)
-        if geom["type"] == "Polygon":
-            lon, lat = geom["coordinates"][0][0]
-            return lat, lon
-        if geom["type"] == "MultiPolygon":
-            lon, lat = geom["coordinates"][0][0][0]
-            return lat, lon
-    except Exception:
+    lat, lon = row.get("center_lat"), row.get("center_lon")
+    if lat is None or lon is None or lat != lat or lon != lon:
         return None
+    return float(lat), float(lon)
+
+# % Impact bucket edges and one RGB color per bucket (see impact_color_expression)
+_IMPACT_PCT_EDGES = np.array([1, 30, 60, 100, 150], dtype=float)
+_IMPACT_PALETTE = np.array(
+    [
+        [200, 200, 200],  # < 1%: gray
+        [0, 170, 0],      # green
+        [245, 200, 0],    # yellow
+        [255, 140, 0],    # orange
+        [255, 90, 90],    # light red
+        [180, 0, 0],      # deep red
+    ],
+    dtype=np.uint8,
+)
+_HIGHLIGHT_COLOR = [0, 120, 255]  # selected building: blue
 
-def impact_to_color(impact_ratio):
+def impact_color_expression():
     """
     Color buckets:
       1% - 30%    -> green
@@ -160,85 +196,73 @@ def impact_to_color(impact_ratio):
       60% - 100%  -> orange
       100% - 150% -> light red
       150%+       -> deep red
-    impact_ratio is stored as 0.92 for 92%.
+    impact is stored as 0.92 for 92%.
+    Returns a deck.gl accessor expression (nested ternaries) evaluated in
+    the browser, so features only carry the impact ratio instead of an
+    [r, g, b] array each.
     """
-    try:
-        pct = float(impact_ratio) * 100.0
-    except Exception:
-        return [200, 200, 200]  # fallback gray
-
-    if pct < 1:
-        return [200, 200, 200]
-    if pct < 30:
-        return [0, 170, 0]        # green
-    if pct < 60:
-        return [245, 200, 0]      # yellow
-    if pct < 100:
-        return [255, 140, 0]      # orange
-    if pct < 150:
-        return [255, 90, 90]      # light red
-    return [180, 0, 0]            # deep red
-
-def get_color_with_selection(row):
-    # Selected building -> highlight
-    if st.session_state.selected_bbl is not None:
-        if str(row.get("BBL", "")) == str(st.session_state.selected_bbl):
-            return [0, 120, 255]  # highlight blue
-    return row.get("impactColor", [200, 200, 200])
-
-def info_row(label, value):
-    if value is None or (isinstance(value, float) and pd.isna(value)):
-        value = "N/A"
-    st.markdown(
-        f"""
-        <div style="margin: 6px 0 14px 0;">
-            <div style="font-size: 13px; color: #6b7280;">
-                {label}
-            </div>
-            <div style="font-size: 16px; font-weight: 600; color: #111827;">
-                {value}
-            </div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+    palette = _IMPACT_PALETTE.tolist()
+    expr = str(palette[-1])
+    for edge, color in zip(_IMPACT_PCT_EDGES[::-1], palette[-2::-1]):
+        # Same float64 arithmetic as the old per-row impact_to_color
+        # (ratio * 100 < edge), so no value changes bucket
+        expr = f"properties.impact * 100 < {edge:g} ? {color} : {expr}"
+    return expr
+
+def top_k_positions(values, k=10):
+    """
+    Return positions of the k largest values, highest first.
+    argpartition is O(N); only the k survivors get sorted.
+    """
+    vals = np.asarray(values, dtype=float)
+    k = min(k, len(vals))
+    if k == 0:
+        return np.array([], dtype=np.intp)
+    idx = np.argpartition(-vals, k - 1)[:k]
+    return idx[np.argsort(-vals[idx], kind="stable")]
+
+# (label, column) for the detail panel; every column is a display string
+# (or N/A-filled category) precomputed in load_data, never missing.
+_DETAIL_FIELDS = (
+    ("Address", "AddressName"),
+    ("Borough", "BoroughName"),
+    ("Zipcode", "ZipcodeStr"),
+    ("BBL", "BBL"),
+
+    ("% Impact", "ImpactPctStr"),
+    ("New Units", "NewUnitsStr"),
+    ("New Floors", "NewFloorsStr"),
+    ("New Building Height", "NewHeightStr"),
+    ("Air Rights", "AirRightsStr"),
+
+    ("Residential Area", "ResidentialAreaStr"),
+    ("Commercial Area", "CommercialAreaStr"),
+    ("Units Residential", "UnitsResidentialStr"),
+    ("Stabilized Units", "StabilizedUnitsStr"),
+    ("% Stabilized", "StabilizedPctStr"),
+    ("Units Commercial", "UnitsCommercialStr"),
+    ("Units Total", "UnitsTotalStr"),
+
+    ("Year Built", "YearBuiltStr"),
+    ("Zoning District 1", "Zoning District 1"),
+    ("Building Class", "Building Class"),
+
+    ("Existing Number of Floors", "ExistingFloorsStr"),
+    ("Owner", "OwnerNameStr"),
+)
 
 def render_detail_two_columns(row):
     """
     Render all details in two columns.
+    Accepts a pandas Series or a dict record.
+    One st.markdown for the whole grid (styled by .info-* at the top).
     """
-    fields = [
-        ("Address", safe_get(row, "Address")),
-        ("Borough", safe_get(row, "Borough")),
-        ("Zipcode", safe_get(row, "Zipcode")),
-        ("BBL", safe_get(row, "BBL")),
-
-        ("% Impact", fmt_percent_from_ratio(safe_get(row, "% of New Units Impact", None))),
-        ("New Units", fmt_int(safe_get(row, "New Units", None))),
-        ("New Floors", fmt_float(safe_get(row, "New Floors", None), nd=2)),
-        ("New Building Height", fmt_height(safe_get(row, "New Building Height", None))),
-        ("Air Rights", fmt_area_sqft(safe_get(row, "Air Rights", None))),
-
-        ("Residential Area", fmt_area_sqft(safe_get(row, "Residential Area", None))),
-        ("Commercial Area", fmt_area_sqft(safe_get(row, "Commercial Area", None))),
-        ("Units Residential", fmt_int(safe_get(row, "Units Residential", None))),
-        ("Stabilized Units", fmt_int(safe_get(row, "Stabilized Units", None))),
-        ("% Stabilized", fmt_percent_from_value(safe_get(row, "% Stabilized", None))),
-        ("Units Commercial", fmt_int(safe_get(row, "Units Commercial", None))),
-        ("Units Total", fmt_int(safe_get(row, "Units Total", None))),
-
-        ("Year Built", fmt_int(safe_get(row, "Year Built", None))),
-        ("Zoning District 1", safe_get(row, "Zoning District 1")),
-        ("Building Class", safe_get(row, "Building Class")),
-
-        ("Existing Number of Floors", fmt_int(safe_get(row, "Existing Number of Floors", None))),
-        ("Owner", safe_get(row, "Owner")),
-    ]
-
-    col1, col2 = st.columns(2)
-    for i, (label, value) in enumerate(fields):
-        with (col1 if i % 2 == 0 else col2):
-            info_row(label, value)
+    cells = "".join(
+        f'<div class="info-cell"><div class="info-label">{label}</div>'
+        f'<div class="info-value">{row[col]}</div></div>'
+        for label, col in _DETAIL_FIELDS
+    )
+    st.markdown(f'<div class="info-grid">{cells}</div>', unsafe_allow_html=True)
 
 def select_property(row):
     """
@@ -252,7 +276,7 @@ def select_property(row):
     st.session_state.selected_bbl = bbl
     st.session_state.view_mode = "single"
 
-    center = get_geojson_center(row.get("geom_geojson"))
+    center = get_row_center(row)
     if center:
         st.session_state.map_center = {"lat": center[0], "lon": center[1], "zoom": 16}
 
@@ -313,9 +337,18 @@ def locate_icon_link(bbl: str) -> str:
 # -----------------------------
 # Load data
 # -----------------------------
-@st.cache_data(show_spinner=True)
+@st.cache_resource
+def get_engine():
+    # One pooled engine per process, reused across load_data cache misses
+    return create_engine(os.environ["DATABASE_URL"], pool_pre_ping=True, pool_size=4)
+
+# Persisted across restarts. After gdf_merged changes, clear BOTH caches
+# (app menu "Clear cache", or st.cache_data.clear() and
+# st.cache_resource.clear()): get_data() and every index derived from it
+# are st.cache_resource and keep serving the previous load until then.
+@st.cache_data(show_spinner=True, persist="disk")
 def load_data():
-    engine = create_engine(os.environ["DATABASE_URL"], pool_pre_ping=True)
+    engine = get_engine()
 
     query = """
         SELECT
@@ -348,20 +381,34 @@ def load_data():
             "latitude" AS latitude,
             "longitude" AS longitude,
 
+            -- Map focus point: guaranteed to fall on the footprint, computed
+            -- in PostGIS so Python never walks the geometry for it.
+            ST_Y(p.pt) AS center_lat,
+            ST_X(p.pt) AS center_lon,
+
+            -- Cast to json so psycopg2 hands back parsed dicts once per
+            -- cache fill instead of re-parsing strings on every rerun.
+            -- Simplify to ~2 m (0.00002 deg) and emit 5 decimals (~1 m):
+            -- visually identical at map zooms, far fewer vertices and
+            -- digits to ship/render.
             ST_AsGeoJSON(
-              ST_Transform(
-                ST_CollectionExtract(ST_MakeValid(geometry), 3),
-                4326
-              )
-            ) AS geom_geojson
-        FROM gdf_merged
-        WHERE geometry IS NOT NULL
-          AND NOT ST_IsEmpty(geometry)
-          AND ST_IsValid(geometry)
+              ST_SimplifyPreserveTopology(geom_4326, 0.00002),
+              5
+            )::json AS geom_geojson
+        -- geom_4326 is the valid, reprojected footprint materialized by
+        -- migrations/001_add_geom_4326.sql (NULL for invalid/empty input).
+        FROM gdf_merged,
+          LATERAL (SELECT ST_PointOnSurface(geom_4326) AS pt) p
+        WHERE geom_4326 IS NOT NULL
     """
 
-    with engine.connect() as conn:
-        df = pd.read_sql_query(text(query), conn)
+    # Server-side cursor, fetched in chunks: psycopg2 never buffers the
+    # whole result (geometry JSON included) as tuples next to the frame.
+    with engine.connect().execution_options(stream_results=True) as conn:
+        df = pd.concat(
+            pd.read_sql_query(text(query), conn, chunksize=20000),
+            ignore_index=True,
+        )
 
     df = df.rename(
         columns={
@@ -391,9 +438,272 @@ def load_data():
         }
     )
 
+    # Ensure correct dtypes (one coercion pass per column group)
+    zero_filled = ["New Units", "% of New Units Impact"]
+    df[zero_filled] = df[zero_filled].apply(pd.to_numeric, errors="coerce").fillna(0)
+    nullable = ["Existing Number of Floors", "Stabilized Units"]
+    df[nullable] = df[nullable].apply(pd.to_numeric, errors="coerce")
+    df["Zipcode"] = pd.to_numeric(df["Zipcode"], errors="coerce").round().astype("Int32")
+    df["% Stabilized"] = (
+        df["% Stabilized"]
+        .astype(str)
+        .str.replace("%", "", regex=False)
+        .str.strip()
+    )
+    df["% Stabilized"] = pd.to_numeric(df["% Stabilized"], errors="coerce")
+
+    # Map tooltip / display fields, derived once per cache fill instead of per rerun
+    df["BBL"] = df["BBL"].astype(str)
+    df["AddressName"] = df["Address"].fillna("N/A")
+    df["CardTitle"] = df["Address"].where(df["Address"].notna(), "BBL " + df["BBL"])
+    df["BoroughName"] = df["Borough"].fillna("N/A")
+    df["ZipcodeStr"] = df["Zipcode"].astype(str).str.zfill(5).where(df["Zipcode"].notna(), "N/A")
+
+    df["ImpactPctStr"] = fmt_percent_column(df["% of New Units Impact"], scale=100)
+    df["StabilizedPctStr"] = fmt_percent_column(df["% Stabilized"])
+    df["OwnerNameStr"] = df["Owner"].fillna("N/A")
+
+    # Detail/tooltip display strings, formatted once per cache fill
+    df["NewUnitsStr"] = fmt_int_column(df["New Units"])
+    df["NewFloorsStr"] = fmt_float_column(df["New Floors"])
+    df["NewHeightStr"] = fmt_height_column(df["New Building Height"])
+    df["AirRightsStr"] = fmt_area_column(df["Air Rights"])
+    df["ResidentialAreaStr"] = fmt_area_column(df["Residential Area"])
+    df["CommercialAreaStr"] = fmt_area_column(df["Commercial Area"])
+    df["UnitsResidentialStr"] = fmt_int_column(df["Units Residential"])
+    df["StabilizedUnitsStr"] = fmt_int_column(df["Stabilized Units"])
+    df["UnitsCommercialStr"] = fmt_int_column(df["Units Commercial"])
+    df["UnitsTotalStr"] = fmt_int_column(df["Units Total"])
+    df["YearBuiltStr"] = fmt_int_column(df["Year Built"])
+    df["ExistingFloorsStr"] = fmt_int_column(df["Existing Number of Floors"])
+
+    # Search keys, lowercased once instead of on every search rerun
+    # (ZIP search matches against ZipcodeStr)
+    df["AddressLower"] = df["Address"].fillna("").str.lower()
+
+    # Narrow numeric dtypes once display fields are derived: float32 is
+    # plenty for coords/heights, whole counts fit nullable Int32.
+    # Area columns are only read raw from here on; their display strings
+    # (text values included) were already built above. The impact ratio
+    # stays float64: map colors and the Top 10 ranking compare it exactly.
+    for c in (
+        "Latitude", "Longitude", "New Floors", "New Building Height",
+        "% Stabilized", "Air Rights", "Residential Area", "Commercial Area",
+    ):
+        df[c] = pd.to_numeric(df[c], errors="coerce").astype("float32")
+    for c in (
+        "New Units", "Units Total", "Existing Number of Floors",
+        "Units Residential", "Units Commercial", "Stabilized Units",
+    ):
+        df[c] = pd.to_numeric(df[c], errors="coerce").round().astype("Int32")
+    df["Year Built"] = pd.to_numeric(df["Year Built"], errors="coerce").round().astype("Int16")
+
+    # Shown as-is in the detail panel, so fill the display default up front
+    for c in ("Zoning District 1", "Building Class"):
+        df[c] = df[c].fillna("N/A")
+
+    # Low-cardinality / repeated text columns: store as categories (int codes)
+    for c in ("Borough", "Zoning District 1", "Building Class", "Owner"):
+        df[c] = df[c].astype("category")
+
     return df
 
-gdf = load_data()
+@st.cache_resource(show_spinner=False)
+def get_data():
+    """
+    The load_data() frame, shared read-only across sessions and reruns.
+    st.cache_data unpickles a fresh copy (GeoJSON dicts included) on
+    every call; this takes that copy once per process. Readers must not
+    mutate it.
+    """
+    return load_data()
+
+@st.cache_resource(show_spinner=False)
+def get_point_index():
+    """
+    STRtree over property (lon, lat) points, built once per process,
+    plus the gdf index label of each tree entry.
+    """
+    df = get_data()
+    lon = df["Longitude"].to_numpy(dtype=float)
+    lat = df["Latitude"].to_numpy(dtype=float)
+    ok = np.isfinite(lon) & np.isfinite(lat)
+    return shapely.STRtree(shapely.points(lon[ok], lat[ok])), df.index.to_numpy()[ok]
+
+@st.cache_resource(show_spinner=False)
+def get_bbl_lookup():
+    """
+    Map BBL string -> gdf index label (first occurrence), built once.
+    """
+    bbls = get_data()["BBL"]
+    first = ~bbls.duplicated()
+    return dict(zip(bbls[first], bbls.index[first]))
+
+# cache_resource like the other get_data() derivatives, so its labels are
+# always cleared together with the frame they index
+@st.cache_resource(show_spinner=False, max_entries=256)
+def top_impact_labels(search_mode, search_query, near_center, k=10):
+    """
+    Index labels (into get_data()) of the k highest-impact properties
+    matching the search and optional "near center" filters.
+    Cached on the filter inputs so unchanged reruns skip the scan.
+    """
+    # Only the columns the filters and ranking read, so the boolean
+    # slices below never copy geometry or display strings
+    filtered = get_data()[["AddressLower", "ZipcodeStr", "Borough", "% of New Units Impact"]]
+
+    # Optional "near center" filter (spatial index, so only nearby rows
+    # are touched by the search filter below)
+    if near_center is not None:
+        lat0, lon0 = near_center
+        tree, tree_labels = get_point_index()
+        window = shapely.box(lon0 - 0.02, lat0 - 0.02, lon0 + 0.02, lat0 + 0.02)
+        filtered = filtered.loc[np.sort(tree_labels[tree.query(window)])]
+
+    # Search filtering
+    if search_query:
+        q = search_query.strip().lower()
+
+        if search_mode == "Address":
+            filtered = filtered[filtered["AddressLower"].str.contains(q, regex=False, na=False)]
+
+        elif search_mode == "ZIP Code":
+            tokens = parse_zip_tokens(q)
+            if len(tokens) > 0:
+                filtered = filtered[filtered["ZipcodeStr"].isin(tokens)]
+
+        elif search_mode == "Borough":
+            # Match against the few distinct categories, then filter by code
+            cats = filtered["Borough"].cat.categories
+            hits = cats[cats.str.lower().str.contains(q, regex=False, na=False)]
+            filtered = filtered[filtered["Borough"].isin(hits)]
+
+    labels = filtered.index.to_numpy()
+    return labels[top_k_positions(filtered["% of New Units Impact"].to_numpy(), k)]
+
+# Feature properties shipped to the browser: the tooltip fields plus BBL
+# (read back on map click) and the impact ratio (colored client-side).
+TOOLTIP_COLS = [
+    "BBL",
+    "AddressName",
+    "BoroughName",
+    "ZipcodeStr",
+    "ImpactPctStr",
+    "NewUnitsStr",
+    "NewFloorsStr",
+    "NewHeightStr",
+    "ExistingFloorsStr",
+    "UnitsResidentialStr",
+    "StabilizedUnitsStr",
+    "OwnerNameStr",
+]
+
+@st.cache_resource(show_spinner=False)
+def get_building_features():
+    """
+    FeatureCollection with every building; independent of the selection,
+    so it is built once and shared across sessions and reruns.
+    """
+    df = get_data()
+    df = df[df["geom_geojson"].notna().to_numpy()]
+
+    # Column lists (native Python scalars) zipped row-wise: no per-row Series
+    columns = [df[c].tolist() for c in TOOLTIP_COLS]
+    impact = df["% of New Units Impact"].tolist()
+    features = [
+        {
+            "type": "Feature",
+            "geometry": geom_obj,
+            "properties": dict(zip(TOOLTIP_COLS, values), impact=impact_ratio),
+        }
+        for geom_obj, impact_ratio, *values in zip(df["geom_geojson"].tolist(), impact, *columns)
+    ]
+
+    return {"type": "FeatureCollection", "features": features}
+
+@st.cache_resource(show_spinner=False)
+def get_feature_lookup():
+    """
+    Map BBL string -> position in get_building_features() (first
+    occurrence), so a selection never goes back to the frame.
+    """
+    lookup = {}
+    for i, feature in enumerate(get_building_features()["features"]):
+        lookup.setdefault(feature["properties"]["BBL"], i)
+    return lookup
+
+@st.cache_resource(show_spinner=False)
+def build_buildings_layer(stroked=False):
+    """
+    GeoJsonLayer with every building, colored by deck.gl from
+    properties.impact. Static: the selection is drawn by a separate
+    highlight layer, so this layer is identical on every rerun.
+    Outlines are off by default (a second draw pass per polygon).
+    """
+    return pdk.Layer(
+        "GeoJsonLayer",
+        data=get_building_features(),
+        id="buildings",
+        pickable=True,
+        stroked=stroked,
+        filled=True,
+        get_fill_color=impact_color_expression(),
+        get_line_color=[255, 255, 255, 200],
+        line_width_min_pixels=1,
+        extruded=False,
+    )
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def build_highlight_layer(selected_bbl):
+    """
+    Single-feature GeoJsonLayer drawn over the selected BBL, or None.
+    Not pickable, so clicks still resolve against the buildings layer.
+    """
+    if selected_bbl is None:
+        return None
+    pos = get_feature_lookup().get(str(selected_bbl))
+    if pos is None:
+        return None
+    geom_obj = get_building_features()["features"][pos]["geometry"]
+
+    return pdk.Layer(
+        "GeoJsonLayer",
+        data={"type": "FeatureCollection", "features": [{"type": "Feature", "geometry": geom_obj, "properties": {}}]},
+        id="selected-building",
+        pickable=False,
+        stroked=True,
+        filled=True,
+        get_fill_color=_HIGHLIGHT_COLOR,
+        get_line_color=[255, 255, 255, 200],
+        line_width_min_pixels=1,
+        extruded=False,
+    )
+
+gdf = get_data()
+
+# Columns the Top 10 cards and their detail panels read (geometry and the
+# raw numeric columns stay out of the per-card records)
+CARD_COLS = list(dict.fromkeys(
+    ["BBL", "CardTitle"]
+    + [col for _, col in _DETAIL_FIELDS]
+))
+
+@st.cache_resource(show_spinner=False)
+def top_focus_center():
+    """
+    (lat, lon) of the highest-impact property, computed once instead of
+    an idxmax over the full column on every rerun.
+    """
+    df = get_data()
+    return get_row_center(df.loc[df["% of New Units Impact"].idxmax()])
+
+def find_property(bbl):
+    """
+    Return the gdf row for a BBL, or None if it is not in the dataset.
+    O(1) via the cached BBL lookup instead of scanning the column.
+    """
+    label = get_bbl_lookup().get(str(bbl))
+    return None if label is None else gdf.loc[label]
 
 # -----------------------------
 # Handle locate click via query params (HTML link)
@@ -414,34 +724,15 @@ def _clear_query_params():
 
 locate_bbl = _get_query_param("locate")
 if locate_bbl:
-    locate_bbl = str(locate_bbl)
-    match = gdf[gdf["BBL"].astype(str) == locate_bbl]
-    if len(match) > 0:
-        select_property(match.iloc[0])
+    row = find_property(locate_bbl)
+    if row is not None:
+        select_property(row)
     _clear_query_params()
     st.rerun()
 
-# Ensure correct dtypes
-gdf["New Units"] = pd.to_numeric(gdf["New Units"], errors="coerce").fillna(0)
-gdf["% of New Units Impact"] = pd.to_numeric(gdf["% of New Units Impact"], errors="coerce").fillna(0)
-gdf["Existing Number of Floors"] = pd.to_numeric(gdf["Existing Number of Floors"], errors="coerce")
-gdf["Stabilized Units"] = pd.to_numeric(gdf["Stabilized Units"], errors="coerce")
-gdf["% Stabilized"] = (
-    gdf["% Stabilized"]
-    .astype(str)
-    .str.replace("%", "", regex=False)
-    .str.strip()
-)
-gdf["% Stabilized"] = pd.to_numeric(gdf["% Stabilized"], errors="coerce")
-
-# Precompute color by impact
-gdf["impactColor"] = gdf["% of New Units Impact"].apply(impact_to_color)
-
 # Default focus: highest impact property
 try:
-    top_idx = gdf["% of New Units Impact"].astype(float).idxmax()
-    top_row = gdf.loc[top_idx]
-    top_center = get_geojson_center(top_row.get("geom_geojson"))
+    top_center = top_focus_center()
     if top_center:
         if st.session_state.map_center == {"lat": 40.7549, "lon": -73.9840, "zoom": 12}:
             st.session_state.map_center = {"lat": top_center[0], "lon": top_center[1], "zoom": 15}
@@ -464,43 +755,7 @@ with col_map:
         st.session_state.view_mode = "top10"
         st.session_state.near_center = None
 
-    gdf_map = gdf.copy()
-    gdf_map["BBL"] = gdf_map["BBL"].astype(str)
-
-    gdf_map["AddressName"] = gdf_map["Address"].fillna("N/A")
-    gdf_map["BoroughName"] = gdf_map["Borough"].fillna("N/A")
-    gdf_map["ZipcodeStr"] = gdf_map["Zipcode"].astype(str).str.zfill(5)
-
-    gdf_map["ImpactPctStr"] = gdf_map["% of New Units Impact"].apply(fmt_percent_from_ratio)
-    gdf_map["NewUnitsNum"] = pd.to_numeric(gdf_map["New Units"], errors="coerce").fillna(0).astype(int)
-    gdf_map["NewFloorsNum"] = pd.to_numeric(gdf_map["New Floors"], errors="coerce").fillna(0)
-    gdf_map["NewHeightNum"] = pd.to_numeric(gdf_map["New Building Height"], errors="coerce").fillna(0)
-    gdf_map["StabilizedUnitsNum"] = pd.to_numeric(gdf_map["Stabilized Units"], errors="coerce").fillna(0).astype(int)
-    gdf_map["StabilizedPctStr"] = gdf_map["% Stabilized"].apply(fmt_percent_from_value)
-    gdf_map["ResidentialUnitsNum"] = pd.to_numeric(
-        gdf_map["Units Residential"], errors="coerce"
-    ).fillna(0).astype(int)
-
-    gdf_map["ExistingFloorsNum"] = pd.to_numeric(
-        gdf_map["Existing Number of Floors"], errors="coerce"
-    ).fillna(np.nan)
-    gdf_map["OwnerNameStr"] = gdf_map["Owner"].fillna("N/A")
-
-    gdf_map["fillColor"] = gdf_map.apply(get_color_with_selection, axis=1)
-
-    features = []
-    for _, r in gdf_map.iterrows():
-        gj = r.get("geom_geojson")
-        if not gj or pd.isna(gj):
-            continue
-        try:
-            geom_obj = json.loads(gj)
-        except Exception:
-            continue
-        props = r.drop(labels=["geom_geojson"]).to_dict()
-        features.append({"type": "Feature", "geometry": geom_obj, "properties": props})
-
-    geo_data = {"type": "FeatureCollection", "features": features}
+    show_borders = st.checkbox("Show polygon borders", value=False)
 
     view_state = pdk.ViewState(
         latitude=st.session_state.map_center["lat"],
@@ -509,21 +764,13 @@ with col_map:
         pitch=0,
     )
 
-    layer = pdk.Layer(
-        "GeoJsonLayer",
-        data=geo_data,
-        id="buildings",
-        pickable=True,
-        stroked=True,
-        filled=True,
-        get_fill_color="properties.fillColor",
-        get_line_color=[255, 255, 255, 200],
-        line_width_min_pixels=1,
-        extruded=False,
-    )
+    layers = [build_buildings_layer(stroked=show_borders)]
+    highlight = build_highlight_layer(st.session_state.selected_bbl)
+    if highlight is not None:
+        layers.append(highlight)
 
     deck = pdk.Deck(
-        layers=[layer],
+        layers=layers,
         initial_view_state=view_state,
         tooltip={
             "html": """
@@ -532,12 +779,12 @@ with col_map:
             <hr/>
             <b>BBL:</b> {BBL}<br/>
             <b>% Impact:</b> {ImpactPctStr}<br/>
-            <b>New Units:</b> {NewUnitsNum}<br/>
-            <b>New Floors:</b> {NewFloorsNum}<br/>
-            <b>New Building Height:</b> {NewHeightNum}<br/>
-            <b>Existing Number of Floors:</b> {ExistingFloorsNum}<br/>
-            <b>Residential Units:</b> {ResidentialUnitsNum}<br/>
-            <b>Stabilized Units:</b> {StabilizedUnitsNum}<br/>
+            <b>New Units:</b> {NewUnitsStr}<br/>
+            <b>New Floors:</b> {NewFloorsStr}<br/>
+            <b>New Building Height:</b> {NewHeightStr}<br/>
+            <b>Existing Number of Floors:</b> {ExistingFloorsStr}<br/>
+            <b>Residential Units:</b> {UnitsResidentialStr}<br/>
+            <b>Stabilized Units:</b> {StabilizedUnitsStr}<br/>
             <b>Owner:</b> {OwnerNameStr}
             """,
             "style": {
@@ -562,10 +809,9 @@ with col_map:
         sel = getattr(chart, "selection", None)
         clicked_bbl = extract_clicked_bbl(sel)
         if clicked_bbl is not None:
-            clicked_bbl = str(clicked_bbl)
-            match = gdf[gdf["BBL"].astype(str) == clicked_bbl]
-            if len(match) > 0:
-                select_property(match.iloc[0])
+            row = find_property(clicked_bbl)
+            if row is not None:
+                select_property(row)
     except Exception:
         pass
 
@@ -577,14 +823,13 @@ with col_list:
 
     if st.session_state.view_mode == "single" and st.session_state.selected_bbl is not None:
         sel_bbl = str(st.session_state.selected_bbl)
-        match = gdf[gdf["BBL"].astype(str) == sel_bbl]
+        row = find_property(sel_bbl)
 
-        if len(match) == 0:
+        if row is None:
             st.warning("Selected property was not found in the dataset.")
         else:
-            row = match.iloc[0]
-            title = safe_get(row, "Address", f"BBL {sel_bbl}")
-            zipcode = safe_get(row, "Zipcode", "N/A")
+            title = row["CardTitle"]
+            zipcode = row["ZipcodeStr"]
 
             st.markdown(f'<div class="card-title">{title}</div>', unsafe_allow_html=True)
             st.markdown(f'<div class="card-sub">New York, NY {zipcode}</div>', unsafe_allow_html=True)
@@ -592,7 +837,7 @@ with col_list:
             b1, b2 = st.columns([1, 1])
             with b1:
                 if st.button("Show Top 10 near this property"):
-                    center = get_geojson_center(row.get("geom_geojson"))
+                    center = get_row_center(row)
                     if center:
                         st.session_state.map_center = {"lat": center[0], "lon": center[1], "zoom": 15}
                         st.session_state.near_center = center
@@ -612,47 +857,23 @@ with col_list:
             render_detail_two_columns(row)
 
     else:
-        filtered = gdf.copy()
-
-        # Search filtering
-        if search_query:
-            q = search_query.strip().lower()
-
-            if search_mode == "Address":
-                filtered = filtered[filtered["Address"].fillna("").str.lower().str.contains(q, na=False)]
-
-            elif search_mode == "ZIP Code":
-                tokens = [t for t in q.replace(",", " ").split() if t]
-                if len(tokens) > 0:
-                    z = filtered["Zipcode"].astype(str).str.zfill(5)
-                    filtered = filtered[z.isin([t.zfill(5) for t in tokens])]
-
-            elif search_mode == "Borough":
-                filtered = filtered[filtered["Borough"].fillna("").str.lower().str.contains(q, na=False)]
-
-        # Optional "near center" filter
-        if st.session_state.use_map_filter and st.session_state.near_center is not None:
-            lat0, lon0 = st.session_state.near_center
-            if "Latitude" in filtered.columns and "Longitude" in filtered.columns:
-                filtered = filtered[
-                    filtered["Latitude"].between(lat0 - 0.02, lat0 + 0.02)
-                    & filtered["Longitude"].between(lon0 - 0.02, lon0 + 0.02)
-                ]
-
-        filtered["% of New Units Impact"] = pd.to_numeric(filtered["% of New Units Impact"], errors="coerce").fillna(0)
-        top10 = filtered.sort_values("% of New Units Impact", ascending=False).head(10)
+        near_center = st.session_state.near_center if st.session_state.use_map_filter else None
+        top10 = gdf.loc[top_impact_labels(search_mode, search_query, near_center), CARD_COLS]
 
         st.caption(f"Top {len(top10)} properties by % Impact")
 
         left_col, right_col = st.columns(2)
 
-        for i, (_, r) in enumerate(top10.iterrows()):
+        records = top10.to_dict("records")
+
+        for i, r in enumerate(records):
             container = left_col if i % 2 == 0 else right_col
 
-            bbl = str(safe_get(r, "BBL", "N/A"))
-            addr = safe_get(r, "Address", f"BBL {bbl}")
-            zc = safe_get(r, "Zipcode", "N/A")
-            impact = fmt_percent_from_ratio(safe_get(r, "% of New Units Impact", None))
+            # Display strings precomputed in load_data
+            bbl = r["BBL"]
+            addr = r["CardTitle"]
+            zc = r["ZipcodeStr"]
+            impact = r["ImpactPctStr"]
 
             with container:
                 header_cols = st.columns([14, 1.2])
@@ -0,0 +1,21 @@
+-- Materialize the valid, WGS84 polygon geometry app.py reads, so the app
+-- query does no ST_MakeValid / ST_CollectionExtract / ST_Transform work.
+-- Run once against DATABASE_URL (re-run the UPDATE after reloading data):
+--   psql "$DATABASE_URL" -f migrations/001_add_geom_4326.sql
+
+ALTER TABLE gdf_merged
+  ADD COLUMN IF NOT EXISTS geom_4326 geometry(MultiPolygon, 4326);
+
+-- Same filter the app query used to apply at read time
+UPDATE gdf_merged
+SET geom_4326 = ST_Multi(
+  ST_Transform(ST_CollectionExtract(ST_MakeValid(geometry), 3), 4326)
+)
+WHERE geometry IS NOT NULL
+  AND NOT ST_IsEmpty(geometry)
+  AND ST_IsValid(geometry);
+
+CREATE INDEX IF NOT EXISTS gdf_merged_geom_4326_gix
+  ON gdf_merged USING GIST (geom_4326);
+
+ANALYZE gdf_merged;